@@ -0,0 +1,216 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import itertools
+import hashlib
+import os
+from datetime import timedelta
+
+# Prefer the Rust-based calamine Excel reader, falling back to openpyxl if it isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Colors for the known task categories
+CATEGORY_COLORS = {
+    'Planning & Preparation': '#009C7C',
+    'Development & Implementation': '#A3D65C',
+    'Documentation': '#4E76E0',
+    'Evaluation & Visual Interface': '#C40C0C',
+    'Progress Monitoring & Mentorship': '#FFCA28',
+    'Bureaucracy & Procurement': '#20C4F4',
+    'Uncategorized': '#808080' # Color for the fallback category
+}
+# Colors cycled through for any new, undefined categories
+FALLBACK_COLORS = ['#808080', '#A4D65E', '#FFE000']
+
+# --- 1. Data Processing ---
+
+@st.cache_data(show_spinner=False)
+def _content_hash(path, mtime_ns, size):
+    """Hashes the file's content; `mtime_ns` and `size` only key the cache."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def file_hash(path):
+    """
+    Returns the SHA-256 of the file's content, or None if the file doesn't exist.
+    The file is only re-read when its modification time or size changes.
+    """
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return _content_hash(path, stat.st_mtime_ns, stat.st_size)
+
+def calculate_progress(df_gantt, today):
+    """Calculates the progress percentage of every task based on today's date."""
+    days_passed = (today - df_gantt['Start']).dt.days + 1
+    duration = df_gantt['Duration'].to_numpy()
+    # Tasks that haven't started yet or have no duration are at 0%; progress is capped at 100%
+    return np.where(
+        (duration <= 0) | (days_passed <= 0),
+        0.0,
+        np.minimum(days_passed / duration, 1.0) * 100
+    )
+
+@st.cache_data(persist="disk", show_spinner=False)
+def load_data(excel_file, content_hash):
+    """
+    Loads and processes the Gantt chart data from the specified Excel file.
+    `content_hash` is only part of the cache key, so the cache is invalidated when the file's content changes.
+    The result is persisted to disk so a server restart doesn't have to re-parse the Excel file.
+    Today-dependent columns are added separately by `add_progress`, so the cached data never goes stale.
+    """
+    try:
+        # Read only the essential columns from the Excel file, skipping the first 8 rows
+        relevant_cols = ['Milestone description', 'Category', 'Start', 'Days']
+        df = pd.read_excel(
+            excel_file,
+            header=8,
+            engine=EXCEL_ENGINE,
+            usecols=lambda col: str(col).strip() in relevant_cols,
+            dtype={'Days': 'float64'}
+        )
+        
+        # Clean up the column names
+        df.columns = df.columns.str.strip()
+        
+        # Check for essential columns
+        if not all(col in df.columns for col in relevant_cols):
+            st.error("Error: Missing essential columns (Milestone description, Category, Start, Days) in the Excel file.")
+            return pd.DataFrame()
+        
+        df = df.dropna(subset=['Start', 'Days'])
+        
+        if df.empty:
+            st.warning("No tasks with valid Start date and Days duration found in the file.")
+            return pd.DataFrame()
+
+        # Rename columns for use in the Gantt chart
+        df_gantt = df.rename(columns={
+            'Milestone description': 'Task',
+            'Start': 'Start_Date_Obj',
+            'Category': 'Resource',
+            'Days': 'Duration'
+        })
+
+        # Fill missing 'Resource' (Category) to prevent 'undefined' in the chart
+        df_gantt['Resource'] = df_gantt['Resource'].fillna('Uncategorized')
+
+        # Convert data types for processing
+        # Excel date cells already come back as datetimes, so only parse when they don't
+        start_dates = df_gantt['Start_Date_Obj']
+        if pd.api.types.is_datetime64_any_dtype(start_dates):
+            df_gantt['Start'] = start_dates
+        else:
+            df_gantt['Start'] = pd.to_datetime(start_dates)
+        df_gantt['Duration'] = pd.to_numeric(df_gantt['Duration'])
+        df_gantt['Finish'] = df_gantt['Start'] + pd.to_timedelta(df_gantt['Duration'], unit='D')
+
+        # Clean up resource names, stored as a categorical since the few categories repeat a lot
+        df_gantt['Resource'] = pd.Categorical(
+            [r.replace('\n', ' ').strip() if isinstance(r, str) else r for r in df_gantt['Resource'].to_numpy()]
+        )
+        
+        return df_gantt
+
+    except FileNotFoundError:
+        st.error(f"Error: The file '{excel_file}' was not found.")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"An error occurred while reading the Excel file: {e}")
+        return pd.DataFrame()
+
+def add_progress(df_gantt, today):
+    """Adds today's progress to the loaded data and appends the percentage to each task name."""
+    df_gantt['Progress'] = calculate_progress(df_gantt, today)
+    progress_pct = df_gantt['Progress'].round().astype(np.int32).to_numpy()
+    df_gantt['Task'] = [f"{task} ({pct}%)" for task, pct in zip(df_gantt['Task'].to_numpy(), progress_pct)]
+    return df_gantt
+
+# --- 2. Chart Building ---
+
+@st.cache_data
+def build_color_map(categories):
+    """Maps each category to its color, assigning fallback colors to unknown categories."""
+    color_map = dict(CATEGORY_COLORS)
+    fallback_colors = itertools.cycle(FALLBACK_COLORS)
+    for cat in categories:
+        if cat not in color_map:
+            color_map[cat] = next(fallback_colors)
+    return color_map
+
+def build_base_figure(df_processed, today_date):
+    """
+    Builds the Gantt figure for the given tasks, without a view-specific x-axis range.
+    """
+    # Use all categories, not just the ones in view, so fallback colors stay stable between views
+    color_map = build_color_map(tuple(df_processed['Resource'].cat.categories))
+
+    # A single timeline trace per category; Plotly takes the datetime columns directly
+    fig = px.timeline(
+        df_processed,
+        x_start='Start',
+        x_end='Finish',
+        y='Task',
+        color='Resource',
+        color_discrete_map=color_map,
+        # Keep the Excel row order, with the first task at the top
+        category_orders={'Task': df_processed['Task'].unique().tolist()}
+    )
+
+    # Apply the layout, the "Today" line and its label in a single update
+    fig.update_layout(
+        title="",  # Hide the default Plotly title
+        legend_title_text="",
+        height=800,
+        hovermode='closest',  # Only look up the bar under the cursor on hover
+        font=dict(family="Open Sans Hebrew, sans-serif", size=12),
+        xaxis=dict(title='Timeline', showgrid=True),
+        yaxis=dict(title='Tasks (Grouped by Category)', showgrid=True),
+        shapes=[dict(
+            type="line",
+            x0=today_date, y0=0,
+            x1=today_date, y1=1,
+            yref="paper",
+            line=dict(color="Red", width=2, dash="dash")
+        )],
+        annotations=[dict(
+            x=today_date,
+            y=1.05,
+            yref="paper",
+            text="Today",
+            showarrow=False,
+            font=dict(color="Red", family="Open Sans Hebrew, sans-serif")
+        )]
+    )
+
+    return fig
+
+@st.cache_data
+def base_figure_json(df_processed, today_date):
+    """
+    Returns the base Gantt figure serialized to JSON.
+    A plain string is cheaper to copy out of the cache than a pickled Figure object.
+    """
+    return build_base_figure(df_processed, today_date).to_json()
+
+def get_view_range(view_option, today_date, project_start_month, project_end_date):
+    """Returns the (start, end) x-axis range for the selected view option."""
+    if view_option == '1W':
+        start_range = today_date - timedelta(days=1)
+        end_range = today_date + timedelta(days=7)
+    elif view_option == '1M':
+        start_range = today_date - timedelta(days=1)
+        end_range = today_date + timedelta(days=30)
+    elif view_option == '3M':
+        start_range = today_date - timedelta(days=1)
+        end_range = today_date + timedelta(days=90)
+    else: # 'All'
+        start_range = project_start_month - timedelta(days=7)
+        end_range = project_end_date + timedelta(days=15)
+
+    return start_range, end_range
@@ -1,5 +1,6 @@
 import pandas as pd
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -10,6 +11,13 @@ import os
 # Note: The file name was corrected from "GANTT TAI.xlsx" to "GANTT_TAI.xlsx".
 FILE_NAME = "GANTT_TAI.xlsx"
 
+# Prefer the Rust-based calamine Excel reader, falling back to openpyxl if it isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
 # --- 2. Date Configuration ---
 # TODAY is dynamically set to the current date when the script runs (e.g., on GitHub Actions).
 TODAY = pd.to_datetime(datetime.today().date())
@@ -20,59 +28,83 @@ def format_tasks_to_html(tasks_df, title):
     if tasks_df.empty:
         return f"<h2>{title}</h2><p>No tasks found for this period.</p>"
     
-    html = f"<h2>{title}</h2>"
-    html += "<table>"
-    html += "<tr><th>Task</th><th>Start Date</th><th>End Date</th></tr>"
-    
-    # Sort tasks by start date
-    tasks_df = tasks_df.sort_values(by='Start')
-    
-    for _, row in tasks_df.iterrows():
-        task_name = row['Task'] if pd.notna(row['Task']) else "Unnamed Task"
-        html += f"<tr><td>{task_name}</td><td>{row['Start'].strftime('%Y-%m-%d')}</td><td>{row['Finish'].strftime('%Y-%m-%d')}</td></tr>"
-        
-    html += "</table>"
-    return html
+    # Build all table rows with vectorized string operations
+    rows = (
+        "<tr><td>" + tasks_df['Task'].fillna("Unnamed Task").astype(str)
+        + "</td><td>" + tasks_df['Start'].dt.strftime('%Y-%m-%d')
+        + "</td><td>" + tasks_df['Finish'].dt.strftime('%Y-%m-%d')
+        + "</td></tr>"
+    )
+
+    # Collect the pieces and join them once instead of growing a string
+    parts = [f"<h2>{title}</h2>", "<table>", "<tr><th>Task</th><th>Start Date</th><th>End Date</th></tr>"]
+    parts.extend(rows)
+    parts.append("</table>")
+    return "".join(parts)
 
 # --- 4. Data Loading and Processing ---
 def create_task_report():
     """Loads data, filters tasks, and generates an HTML report."""
     try:
-        # Read the Excel file using openpyxl, skipping the first 8 rows (header is on row 9)
+        # Read only the essential columns, skipping the first 8 rows (header is on row 9)
         # This fixes the issue where the script was incorrectly trying to read a CSV.
-        df = pd.read_excel(FILE_NAME, header=8, engine='openpyxl')
-        
-        # Clean up the DataFrame
-        df = df.dropna(how='all').dropna(axis=1, how='all')
-        df.columns = df.columns.str.strip()
-        
         relevant_cols = ['Milestone description', 'Start', 'Days']
+
+        # Drop empty columns and clean up the column names
+        df = (
+            pd.read_excel(
+                FILE_NAME,
+                header=8,
+                engine=EXCEL_ENGINE,
+                usecols=lambda col: str(col).strip() in relevant_cols
+            )
+            .dropna(axis=1, how='all')
+            .rename(columns=str.strip)
+        )
+        
         if not all(col in df.columns for col in relevant_cols):
             print("Error: Missing essential columns.")
             return None
         
-        df = df[relevant_cols].copy()
-        df = df.dropna(subset=['Start', 'Days'])
-        df = df.rename(columns={'Milestone description': 'Task'})
-        
-        df['Start'] = pd.to_datetime(df['Start'], errors='coerce')
-        df['Days'] = pd.to_numeric(df['Days'], errors='coerce')
-        df = df.dropna(subset=['Start', 'Days'])
-        
-        # Calculate INCLUSIVE Finish date (Start + Days - 1)
-        df['Finish'] = df.apply(lambda row: row['Start'] + timedelta(days=max(0, row['Days'] - 1)), axis=1)
+        # Clean up the tasks in a single chain, without intermediate copies of the frame.
+        # Excel date cells already come back as datetimes, so Start is only parsed when they don't.
+        # Finish is INCLUSIVE (Start + Days - 1), and tasks are sorted by start date once;
+        # the filtered subsets below keep this order.
+        df = (
+            df.dropna(subset=['Start', 'Days'])
+            .rename(columns={'Milestone description': 'Task'})
+            .assign(
+                Start=lambda d: d['Start'] if pd.api.types.is_datetime64_any_dtype(d['Start'])
+                else pd.to_datetime(d['Start'], errors='coerce'),
+                Days=lambda d: pd.to_numeric(d['Days'], errors='coerce')
+            )
+            .dropna(subset=['Start', 'Days'])
+            .assign(Finish=lambda d: d['Start'] + pd.to_timedelta((d['Days'] - 1).clip(lower=0), unit='D'))
+            .sort_values('Start', kind='mergesort')
+            .reset_index(drop=True)
+        )
 
         # --- Task Filtering ---
         # Calculate start/end of the current week (Sunday to Saturday)
         start_of_week = TODAY - pd.to_timedelta(TODAY.dayofweek, unit='d')
         end_of_week = start_of_week + pd.to_timedelta(6, unit='d')
 
-        tasks_active_today = df[(df['Start'] <= TODAY) & (df['Finish'] >= TODAY)]
-        tasks_ending_today = df[df['Finish'].dt.date == TODAY.date()]
-        tasks_starting_today = df[df['Start'].dt.date == TODAY.date()]
-        tasks_ending_this_week = df[(df['Finish'] >= start_of_week) & (df['Finish'] <= end_of_week)]
-        tasks_starting_this_week = df[(df['Start'] >= start_of_week) & (df['Start'] <= end_of_week)]
-        tasks_active_this_week = df[(df['Start'] <= end_of_week) & (df['Finish'] >= start_of_week)]
+        # Extract the date columns once as day-resolution datetime64[D] arrays,
+        # and reuse the comparisons shared between filters
+        start = df['Start'].to_numpy().astype('datetime64[D]')
+        finish = df['Finish'].to_numpy().astype('datetime64[D]')
+        today = np.datetime64(TODAY.date(), 'D')
+        week_start = np.datetime64(start_of_week.date(), 'D')
+        week_end = np.datetime64(end_of_week.date(), 'D')
+        starts_by_week_end = start <= week_end
+        finishes_from_week_start = finish >= week_start
+
+        tasks_active_today = df.loc[(start <= today) & (finish >= today)]
+        tasks_ending_today = df.loc[finish == today]
+        tasks_starting_today = df.loc[start == today]
+        tasks_ending_this_week = df.loc[finishes_from_week_start & (finish <= week_end)]
+        tasks_starting_this_week = df.loc[(start >= week_start) & starts_by_week_end]
+        tasks_active_this_week = df.loc[starts_by_week_end & finishes_from_week_start]
 
         # --- Generate HTML Report ---
         html_style = """
@@ -141,16 +173,16 @@ def send_email(html_content):
     
     try:
         print(f"Connecting to {SMTP_SERVER}...")
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        print("Login successful.")
-        
-        # Send the email to all recipients in the list
-        server.sendmail(SENDER_EMAIL, RECIPIENT_EMAILS, msg.as_string())
+        # The context manager closes the connection even if login or sending fails
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+            server.starttls()
+            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+            print("Login successful.")
+            
+            # Send the email to all recipients in the list over the single connection
+            server.send_message(msg, from_addr=SENDER_EMAIL, to_addrs=RECIPIENT_EMAILS)
         
         print(f"Email sent successfully to: {RECIPIENT_EMAILS}!")
-        server.quit()
     except Exception as e:
         # This typically indicates an issue with GMAIL_PASS (needs to be an App Password)
         print(f"Error sending email: {e}")